@@ -1,9 +1,14 @@
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.theme import Theme
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.logging import RichHandler
+
+    console: Console
+    handler: RichHandler
 
 
 __version__ = '0.2.4'
@@ -17,20 +22,42 @@ PKG_NAME = PKG_DIR.name
 
 LOG_FMT = '- %(message)s'
 DATE_FMT = '%Y-%m-%d %H:%M:%S'
-theme = Theme({'log.time': 'cyan'})
-
-console = Console(stderr=True, theme=theme)
-handler = RichHandler(
-    omit_repeated_times=False,
-    show_level=False,
-    show_path=False,
-    markup=True,
-    console=console,
-)
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FMT,
-    datefmt=DATE_FMT,
-    handlers=[handler]
-)
+
+
+def _setup_rich() -> None:
+    """Sets up the global console and rich log handler.
+    This is deferred until one of them is first needed, since importing rich's logging machinery is relatively slow."""
+    global console, handler
+    from rich.console import Console
+    from rich.logging import RichHandler
+    from rich.theme import Theme
+    theme = Theme({'log.time': 'cyan'})
+    console = Console(stderr=True, theme=theme)
+    handler = RichHandler(
+        omit_repeated_times=False,
+        show_level=False,
+        show_path=False,
+        markup=True,
+        console=console,
+    )
+    handler.setFormatter(logging.Formatter(LOG_FMT, datefmt=DATE_FMT))
+
+
+class _DeferredRichHandler(logging.Handler):
+    """Log handler that forwards records to the rich handler, setting it up when the first record is emitted."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if 'handler' not in globals():
+            _setup_rich()
+        handler.handle(record)
+
+
+logging.basicConfig(level=logging.INFO, handlers=[_DeferredRichHandler()])
 logger = logging.getLogger(PROG)
+
+
+def __getattr__(name: str) -> Any:
+    if name in ('console', 'handler'):
+        _setup_rich()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
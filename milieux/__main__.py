@@ -0,0 +1,17 @@
+from pathlib import Path
+import sys
+
+
+def main() -> None:
+    """Entry point for the milieux executable.
+    A bare `--version` is answered directly, without importing the (relatively slow) CLI machinery."""
+    if sys.argv[1:] == ['--version']:
+        from milieux import __version__
+        print(f'{Path(sys.argv[0]).name} {__version__}')
+        return
+    from milieux.cli.main import MilieuxCLI
+    MilieuxCLI.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,22 @@
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Union
-
-from fancy_dataclass import CLIDataclass
-from rich.prompt import Confirm, Prompt
+from typing import Union
 
 from milieux import PROG, logger
+from milieux.cli.lazy import LazyCLIDataclass
 from milieux.config import Config, PipConfig, get_config_path, user_default_base_dir
 from milieux.errors import ConfigNotFoundError
+from milieux.utils import LineConfirm, LinePrompt, write_stdout
+
+
+# default values of the string-valued config fields
+_CONFIG_STR_DEFAULTS: dict[str, str] = {
+    name: fld.default for (name, fld) in Config.__dataclass_fields__.items() if isinstance(fld.default, str)
+}
 
 
 @dataclass
-class ConfigNew(CLIDataclass, command_name='new'):
+class ConfigNew(LazyCLIDataclass, command_name='new'):
     """Create a new config file."""
     stdout: bool = field(
         default=False,
@@ -21,39 +26,31 @@ class ConfigNew(CLIDataclass, command_name='new'):
     def run(self) -> None:
         """Creates a new config file interactively."""
         path = get_config_path()
-        write = True
         if (not self.stdout) and path.exists():
             prompt = f'Config file {path} already exists. Overwrite?'
-            write = Confirm.ask(prompt)
-        if not write:
-            return
+            if not LineConfirm.ask(prompt, default=False, show_default=False):
+                return
         default_base_dir = user_default_base_dir()
-        base_dir = Prompt.ask('Base directory for workspace', default=str(default_base_dir)).strip()
+        base_dir = LinePrompt.ask('Base directory for workspace', default=str(default_base_dir)).strip()
         if not (p := Path(base_dir)).is_dir():
             prompt = f'Directory {p} does not exist. Create it?'
-            create = Confirm.ask(prompt)
-            if create:
-                p.mkdir(parents=True)
-                logger.info(f'Created directory {p}')
-            else:
+            if not LineConfirm.ask(prompt, default=False, show_default=False):
                 return
-        kwargs: dict[str, Any] = {'base_dir': base_dir}
-        default_env_dir = Config.__dataclass_fields__['env_dir'].default
-        assert isinstance(default_env_dir, str)
-        kwargs['env_dir'] = Prompt.ask('Directory for env_dir', default=default_env_dir).strip()
+            p.mkdir(parents=True)
+            logger.info(f'Created directory {p}')
+        env_dir = LinePrompt.ask('Directory for env_dir', default=_CONFIG_STR_DEFAULTS['env_dir']).strip()
         # TODO: access ~/.pip/pip.conf to retrieve index_url if it exists
-        index_url = Prompt.ask('PyPI index URL \\[optional]').strip() or None
-        kwargs['pip'] = PipConfig(index_url=index_url)
-        cfg = Config(**kwargs)
+        index_url = LinePrompt.ask('PyPI index URL \\[optional]').strip() or None
+        cfg = Config(base_dir=base_dir, env_dir=env_dir, pip=PipConfig(index_url=index_url))
         if self.stdout:
-            print('\n' + cfg.to_toml_string())
+            write_stdout('\n' + cfg.to_toml_string() + '\n')
         else:
             cfg.save(path)
             logger.info(f'Saved config file to {path}')
 
 
 @dataclass
-class ConfigPath(CLIDataclass, command_name='path'):
+class ConfigPath(LazyCLIDataclass, command_name='path'):
     """Print out path to the configurations."""
 
     def run(self) -> None:
@@ -62,20 +59,20 @@ class ConfigPath(CLIDataclass, command_name='path'):
 
 
 @dataclass
-class ConfigShow(CLIDataclass, command_name='show'):
+class ConfigShow(LazyCLIDataclass, command_name='show'):
     """Show the configurations."""
 
     def run(self) -> None:
         """Displays the contents of the user's config file."""
         if (path := get_config_path()).exists():
-            cfg = Config.load(path)
+            cfg = Config.load_config(path)
             print(cfg.to_toml_string())
         else:
             raise ConfigNotFoundError(f"No config file found. Run '{PROG} config new' to create a new one.")
 
 
 @dataclass
-class ConfigCmd(CLIDataclass, command_name='config'):
+class ConfigCmd(LazyCLIDataclass, command_name='config'):
     """Manage configurations."""
 
     subcommand: Union[
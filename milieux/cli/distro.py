@@ -1,14 +1,14 @@
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cache
 from typing import Any, Optional, Union
 
-from fancy_dataclass.cli import CLIDataclass
-
-from milieux.distro import Distro
+from milieux.cli.lazy import LazyCLIDataclass
 from milieux.errors import DistroExistsError
 from milieux.utils import NonemptyPrompt, distro_sty
 
 
+@cache
 def _get_name_field(required: bool) -> Any:
     # make 'name' a positional argument
     metadata = {'args': ['name'], 'help': 'name of distro'}
@@ -26,15 +26,16 @@ _force_field = field(
 
 
 @dataclass
-class DistroList(CLIDataclass, command_name='list'):
+class DistroList(LazyCLIDataclass, command_name='list'):
     """List all distros."""
 
     def run(self) -> None:
+        from milieux.distro import Distro
         Distro.list()
 
 
 @dataclass
-class DistroLock(CLIDataclass, command_name='lock'):
+class DistroLock(LazyCLIDataclass, command_name='lock'):
     """Lock dependencies in a distro."""
     name: str = _get_name_field(required=True)
     new: Optional[str] = field(default=None, metadata={'nargs': '?', 'const': '', 'help': 'name of new locked distro'})
@@ -42,27 +43,26 @@ class DistroLock(CLIDataclass, command_name='lock'):
     annotate: bool = field(default=False, metadata={'help': 'include comment annotations indicating the source of each package'})
 
     def run(self) -> None:
+        from milieux.distro import Distro
         distro = Distro(self.name)
-        if self.new is None:
-            new_name = None
-        else:
+        new_distro = None
+        if self.new is not None:
             if self.new == '':
                 now = datetime.now()
                 new_name = self.name + '.' + now.strftime('%Y%m%d')
             else:
                 new_name = self.new
-            if (not self.force) and Distro(new_name).exists():
+            new_distro = Distro(new_name)
+            if (not self.force) and new_distro.exists():
                 raise DistroExistsError(f'Distro {distro_sty(new_name)} already exists')
-        output = distro.lock(annotate=self.annotate)
-        if self.new is None:  # print new file to stdout
-            print(output)
+        if new_distro is None:  # print new file to stdout
+            print(distro.lock(annotate=self.annotate))
         else:
-            assert new_name is not None
-            Distro.new(new_name, packages=output.splitlines(), force=self.force)
+            new_distro.create_locked(distro, annotate=self.annotate, force=self.force)
 
 
 @dataclass
-class DistroNew(CLIDataclass, command_name='new'):
+class DistroNew(LazyCLIDataclass, command_name='new'):
     """Create a new distro."""
     name: str = _get_name_field(required=False)
     packages: list[str] = field(
@@ -80,6 +80,7 @@ class DistroNew(CLIDataclass, command_name='new'):
     force: bool = _force_field
 
     def run(self) -> None:
+        from milieux.distro import Distro
         name = self.name or NonemptyPrompt.ask('Name of distro')
         if (not self.packages) and (not self.requirements) and (not self.distros):
             packages_str = NonemptyPrompt.ask('Packages to include (comma-separated)')
@@ -90,25 +91,27 @@ class DistroNew(CLIDataclass, command_name='new'):
 
 
 @dataclass
-class DistroRemove(CLIDataclass, command_name='remove'):
+class DistroRemove(LazyCLIDataclass, command_name='remove'):
     """Remove a distro."""
     name: str = _get_name_field(required=True)
 
     def run(self) -> None:
+        from milieux.distro import Distro
         Distro(self.name).remove()
 
 
 @dataclass
-class DistroShow(CLIDataclass, command_name='show'):
+class DistroShow(LazyCLIDataclass, command_name='show'):
     """Show the contents of a distro."""
     name: str = _get_name_field(required=True)
 
     def run(self) -> None:
+        from milieux.distro import Distro
         Distro(self.name).show()
 
 
 @dataclass
-class DistroCmd(CLIDataclass, command_name='distro'):
+class DistroCmd(LazyCLIDataclass, command_name='distro'):
     """Manage distros."""
     subcommand: Union[
         DistroList,
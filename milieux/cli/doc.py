@@ -1,18 +1,15 @@
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from pkgutil import ModuleInfo
-import time
+from time import perf_counter
 from types import ModuleType
 from typing import Any, Callable, Literal, Union
 
-from fancy_dataclass import ArgparseDataclass, CLIDataclass
-import pdoc.doc
-import pdoc.extract
-import pdoc.render
-import pdoc.web
+from fancy_dataclass import ArgparseDataclass
 
 from milieux import logger
-from milieux.distro import get_packages
+from milieux.cli.lazy import LazyCLIDataclass
 
 
 DocFormat = Literal['markdown', 'google', 'numpy', 'restructuredtext']
@@ -20,6 +17,8 @@ DocFormat = Literal['markdown', 'google', 'numpy', 'restructuredtext']
 
 def _patch_pdoc() -> None:
     """Override the default `__all__` behavior of pdoc so that it presents all submodules of a package even when it declares an `__all__` member."""
+    import pdoc.doc
+    import pdoc.extract
     _iter_modules2: Callable[[ModuleType], dict[str, ModuleInfo]] = pdoc.extract.iter_modules2
     _doc_init = pdoc.doc.Doc.__init__
     def iter_modules2(module: ModuleType) -> dict[str, ModuleInfo]:
@@ -51,10 +50,12 @@ class PkgArgs(ArgparseDataclass):
         metadata={'nargs': '+', 'args': ['-d', '--distros'], 'help': 'existing distro name(s) to include'}
     )
 
-    @property
+    @cached_property
     def all_packages(self) -> list[str]:
-        """Gets a list of all packages."""
-        return get_packages(self.packages, self.requirements, self.distros)
+        """Gets a list of all packages (the requirements files are only read once).
+        Packages are deduplicated but not sorted: they appear in the order given, followed by those in the requirements files, skipping comments."""
+        from milieux.distro import iter_packages
+        return list(iter_packages(self.packages, self.requirements, self.distros))
 
 
 @dataclass
@@ -68,11 +69,12 @@ class RenderArgs(ArgparseDataclass):
 
     def configure(self) -> None:
         """Configures the global pdoc render settings."""
+        import pdoc.render
         pdoc.render.configure(docformat=self.docformat)
 
 
 @dataclass
-class DocBuild(CLIDataclass, command_name='build'):
+class DocBuild(LazyCLIDataclass, command_name='build'):
     """Build API documentation."""
     output_dir: Path = field(
         metadata={
@@ -90,17 +92,18 @@ class DocBuild(CLIDataclass, command_name='build'):
     )
 
     def run(self) -> None:
+        import pdoc
         self.render_args.configure()
-        start = time.perf_counter()
+        start = perf_counter()
         logger.info(f'Building documentation to {self.output_dir}...')
         _patch_pdoc()
         pdoc.pdoc(*self.pkg_args.all_packages, output_directory=self.output_dir)
-        elapsed = time.perf_counter() - start
+        elapsed = perf_counter() - start
         logger.info(f'Build docs in {elapsed:.3g} sec')
 
 
 @dataclass
-class DocServe(CLIDataclass, command_name='serve'):
+class DocServe(LazyCLIDataclass, command_name='serve'):
     """Serve API documentation."""
     host: str = field(
         default='localhost',
@@ -124,6 +127,7 @@ class DocServe(CLIDataclass, command_name='serve'):
     )
 
     def run(self) -> None:
+        import pdoc.web
         self.render_args.configure()
         logger.info('Serving documentation...')
         _patch_pdoc()
@@ -144,7 +148,7 @@ class DocServe(CLIDataclass, command_name='serve'):
 
 
 @dataclass
-class DocCmd(CLIDataclass, command_name='doc'):
+class DocCmd(LazyCLIDataclass, command_name='doc'):
     """Generate API documentation."""
     subcommand: Union[
         DocBuild,
@@ -1,16 +1,20 @@
 from argparse import RawDescriptionHelpFormatter
 from dataclasses import dataclass, field
+from functools import cache
 from pathlib import Path
-from typing import Any, Optional, Union
-
-from fancy_dataclass.cli import CLIDataclass
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from milieux import PROG
-from milieux.env import TEMPLATE_ENV_VARS, Environment, get_active_environment
-from milieux.errors import EnvError, NoSuchTemplateError, UserInputError
+from milieux.cli.lazy import LazyCLIDataclass
+from milieux.errors import EnvError, NoPackagesError, UserInputError
 from milieux.utils import NonemptyPrompt
 
 
+if TYPE_CHECKING:
+    from milieux.env import Environment
+
+
+@cache
 def _get_name_field(required: bool) -> Any:
     # make 'name' a positional argument
     metadata = {'args': ['name'], 'help': 'name of environment'}
@@ -35,20 +39,18 @@ _distros_field: Any = field(
 
 
 @dataclass
-class _EnvSubcommand(CLIDataclass):
-
-    def _get_environment(self) -> Environment:
-        assert hasattr(self, 'name')
-        if self.name is None:
-            if (env := get_active_environment()) is None:
-                raise EnvError(f'Not currently in an environment managed by {PROG}')
-            name = env.name
-        else:
-            name = self.name
-        return Environment(name)
+class _EnvSubcommand(LazyCLIDataclass):
 
-    def run(self) -> None:
-        raise NotImplementedError
+    if TYPE_CHECKING:  # declared (without creating a field) so subclasses are known to have a name
+        name: Optional[str]
+
+    def _get_environment(self) -> 'Environment':
+        from milieux.env import Environment, get_active_environment
+        if self.name is not None:  # explicit name: no need to inspect the active environment
+            return Environment(self.name)
+        if (env := get_active_environment()) is None:
+            raise EnvError(f'Not currently in an environment managed by {PROG}')
+        return env
 
 
 @dataclass
@@ -92,6 +94,9 @@ class EnvInstall(EnvSubcommand, command_name='install'):
     )
 
     def run(self) -> None:
+        # fail fast before resolving the environment if there is nothing to install
+        if not (self.packages or self.requirements or self.distros or self.editable):
+            raise NoPackagesError('Must specify packages to install')
         env = self._get_environment()
         env.install(packages=self.packages, requirements=self.requirements, distros=self.distros, upgrade=self.upgrade, editable=self.editable)
 
@@ -101,6 +106,7 @@ class EnvList(_EnvSubcommand, command_name='list'):
     """List all environments."""
 
     def run(self) -> None:
+        from milieux.env import Environment
         Environment.list()
 
 
@@ -124,6 +130,7 @@ class EnvNew(EnvSubcommand, command_name='new'):
     )
 
     def run(self) -> None:
+        from milieux.env import Environment
         name = self.name or NonemptyPrompt.ask('Name of environment')
         Environment.new(name, seed=self.seed, python=self.python, force=self.force)
 
@@ -133,7 +140,7 @@ class EnvRemove(EnvSubcommandNameRequired, command_name='remove'):
     """Remove an environment."""
 
     def run(self) -> None:
-        Environment(self.name).remove()
+        self._get_environment().remove()
 
 
 @dataclass
@@ -164,9 +171,20 @@ Run `milieux distro lock` to create one."""
 
 
 _env_template_descr_brief = 'render one or more jinja templates, filling in variables from an environment'
-_env_template_descr = f'{_env_template_descr_brief.capitalize()}.\n\nThe following variables from the environment may be used in {{{{ENV_VARIABLE}}}}\nexpressions within your template:\n'
-_env_template_descr += '\n'.join(f'\t{key}: {val}' for (key, val) in TEMPLATE_ENV_VARS.items())
-_env_template_descr += '\n\nExtra variables may be provided via the --extra-vars argument.'
+
+@cache
+def _env_template_descr() -> str:
+    # built on demand, since it is only needed when the 'env template' parser is configured
+    from milieux.env import TEMPLATE_ENV_VARS_HELP
+    return '\n'.join((
+        f'{_env_template_descr_brief.capitalize()}.',
+        '',
+        'The following variables from the environment may be used in {{ENV_VARIABLE}}',
+        'expressions within your template:',
+        TEMPLATE_ENV_VARS_HELP,
+        '',
+        'Extra variables may be provided via the --extra-vars argument.',
+    ))
 
 
 @dataclass
@@ -174,7 +192,6 @@ class EnvTemplate(EnvSubcommandNameRequired,
     command_name='template',
     formatter_class=RawDescriptionHelpFormatter,
     help_descr_brief=_env_template_descr_brief,
-    help_descr=_env_template_descr,
 ):
     """Render a template, filling in variables from an environment."""
     templates: list[Path] = field(
@@ -190,29 +207,26 @@ class EnvTemplate(EnvSubcommandNameRequired,
         metadata={'nargs': '+', 'help': 'extra variables to pass to template, format is: "VAR1=VALUE1 VAR2=VALUE2 ..."'}
     )
 
+    @classmethod
+    def parser_kwargs(cls) -> dict[str, Any]:
+        return {**super().parser_kwargs(), 'description': _env_template_descr()}
+
     def __post_init__(self) -> None:
         # parse extra_vars
         extra_vars = {}
         for tok in self.extra_vars:
-            if '=' in tok:
-                [key, val] = tok.split('=', maxsplit=1)
-                if key in extra_vars:
-                    raise UserInputError(f'Duplicate variable {key!r} in --extra-vars')
-                extra_vars[key] = val
-            else:
+            (key, sep, val) = tok.partition('=')
+            if not sep:
                 raise UserInputError(f'Invalid VARIABLE=VALUE string: {tok}')
+            if key in extra_vars:
+                raise UserInputError(f'Duplicate variable {key!r} in --extra-vars')
+            extra_vars[key] = val
         self._extra_vars = extra_vars
 
     def run(self) -> None:
-        assert self.name is not None
         if (not self.suffix) and (len(self.templates) > 1):
             raise UserInputError('When rendering multiple templates, you must set a --suffix for output files')
-        for template in self.templates:
-            if not template.is_file():
-                raise NoSuchTemplateError(template)
-        env = Environment(self.name)
-        for template in self.templates:
-            env.render_template(template=template, suffix=self.suffix, extra_vars=self._extra_vars)
+        self._get_environment().render_templates(self.templates, suffix=self.suffix, extra_vars=self._extra_vars)
 
 
 @dataclass
@@ -223,11 +237,14 @@ class EnvUninstall(EnvSubcommand, command_name='uninstall'):
     distros: list[str] = _distros_field
 
     def run(self) -> None:
+        # fail fast before resolving the environment if there is nothing to uninstall
+        if not (self.packages or self.requirements or self.distros):
+            raise NoPackagesError('Must specify packages to uninstall')
         self._get_environment().uninstall(packages=self.packages, requirements=self.requirements, distros=self.distros)
 
 
 @dataclass
-class EnvCmd(CLIDataclass, command_name='env'):
+class EnvCmd(LazyCLIDataclass, command_name='env'):
     """Manage environments."""
 
     subcommand: Union[
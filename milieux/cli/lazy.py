@@ -0,0 +1,48 @@
+from argparse import ArgumentParser, _ArgumentGroup
+from collections.abc import Callable, Sequence
+from functools import partial
+from typing import Any, Optional, Union
+
+from fancy_dataclass.cli import CLIDataclass
+
+
+class LazyArgumentParser(ArgumentParser):
+    """Argument parser whose arguments can be configured the first time it is used, rather than up front.
+    Since subparsers are created with the same class as their parent, the arguments for a subcommand are only configured if that subcommand is invoked (or its help is shown)."""
+
+    _configure: Optional[Callable[[], None]] = None
+
+    def defer(self, configure: Callable[[], None]) -> None:
+        """Sets a function to be called to configure the parser the first time it is used."""
+        self._configure = configure
+
+    def _ensure_configured(self) -> None:
+        if (configure := self._configure) is not None:
+            self._configure = None
+            configure()
+
+    def parse_known_args(self, args: Optional[Sequence[str]] = None, namespace: Any = None) -> tuple[Any, list[str]]:  # type: ignore[override]  # noqa: D102
+        self._ensure_configured()
+        return super().parse_known_args(args, namespace)
+
+    def format_usage(self) -> str:  # noqa: D102
+        self._ensure_configured()
+        return super().format_usage()
+
+    def format_help(self) -> str:  # noqa: D102
+        self._ensure_configured()
+        return super().format_help()
+
+
+class LazyCLIDataclass(CLIDataclass, parser_class=LazyArgumentParser):
+    """CLIDataclass whose parser is configured lazily.
+    When used as a subcommand, its arguments are only configured if the subcommand is selected."""
+
+    @classmethod
+    def configure_parser(cls, parser: Union[ArgumentParser, _ArgumentGroup]) -> None:
+        """Configures an argument parser by adding the appropriate arguments.
+        If the parser is a LazyArgumentParser, this is deferred until the parser is first used."""
+        if isinstance(parser, LazyArgumentParser):
+            parser.defer(partial(super().configure_parser, parser))
+        else:
+            super().configure_parser(parser)
@@ -1,18 +1,17 @@
 #!/usr/bin/env python3
 
 from dataclasses import dataclass, field
+import io
 from pathlib import Path
 import sys
-import traceback
 from typing import Optional, Union
 
-from fancy_dataclass import CLIDataclass
-
 from milieux import PROG, __version__, logger
-from milieux.cli.config import ConfigCmd
+from milieux.cli.config import ConfigCmd, ConfigNew
 from milieux.cli.distro import DistroCmd
 from milieux.cli.doc import DocCmd
 from milieux.cli.env import EnvCmd
+from milieux.cli.lazy import LazyCLIDataclass
 from milieux.cli.scaffold import ScaffoldCmd
 from milieux.config import Config, set_config_path, user_default_config_path
 from milieux.errors import MilieuxError
@@ -32,13 +31,14 @@ def _handle_error(exc: BaseException) -> None:
         raise
     else:  # no cov
         # unexpected error: show full traceback
+        import traceback
         lines = traceback.format_exception(type(exc), exc, exc.__traceback__)
         msg = ''.join(lines)
     _exit_with_error(msg)
 
 
 @dataclass
-class MilieuxCLI(CLIDataclass, version=f'%(prog)s {__version__}'):
+class MilieuxCLI(LazyCLIDataclass, version=f'%(prog)s {__version__}'):
     """Tool to assist in developing, building, and installing Python packages."""
     subcommand: Union[
         ConfigCmd,
@@ -53,13 +53,14 @@ class MilieuxCLI(CLIDataclass, version=f'%(prog)s {__version__}'):
     )
 
     def _load_config(self) -> None:
+        default_config_path = user_default_config_path()
+        config_path = self.config or default_config_path
         try:
-            config_path = self.config or user_default_config_path()
             set_config_path(config_path.absolute())
             Config.load_config(config_path)
         except FileNotFoundError:
             msg = f"Could not find config file {config_path}: run '{PROG} config new' to create one"
-            if config_path != user_default_config_path():
+            if config_path != default_config_path:
                 _exit_with_error(msg)
             if self.subcommand_name != 'config':
                 logger.warning(msg)
@@ -70,12 +71,19 @@ class MilieuxCLI(CLIDataclass, version=f'%(prog)s {__version__}'):
 
     def run(self) -> None:
         """Top-level CLI app for milieux."""
-        self._load_config()
+        if isinstance(self.subcommand, ConfigCmd) and isinstance(self.subcommand.subcommand, ConfigNew):
+            # creating a config file never needs to read one (which may not exist yet)
+            set_config_path((self.config or user_default_config_path()).absolute())
+        else:
+            self._load_config()
         super().run()
 
     @classmethod
     def main(cls, arg_list: Optional[list[str]] = None) -> None:
         """Add custom error handling to main function to exit gracefully when possible."""
+        if isinstance(sys.stdout, io.TextIOWrapper):
+            # flush output line by line, even when piped, so downstream commands see it promptly
+            sys.stdout.reconfigure(line_buffering=True)
         try:
             super().main(arg_list=arg_list)  # delegate to subcommand
         except BaseException as exc:
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+import json
+import os
 from pathlib import Path
+import shutil
 import subprocess
 from typing import Literal
 
-from fancy_dataclass.cli import CLIDataclass
-
 from milieux import logger
+from milieux.cli.lazy import LazyCLIDataclass
 from milieux.utils import run_command
 
 
@@ -14,6 +16,27 @@ from milieux.utils import run_command
 ScaffoldUtility = Literal['hatch', 'uv']
 
 
+def _hatch_config_path() -> str:
+    """Gets the path to hatch's config file, as reported by `hatch config find`.
+    Since that command starts up a whole Python interpreter, the result is cached in the user's directory, keyed on the hatch executable and the environment variables that affect the config location."""
+    from milieux.config import user_dir
+    hatch = shutil.which('hatch')
+    key = [hatch, Path(hatch).stat().st_mtime_ns if hatch else None, os.environ.get('HATCH_CONFIG'), os.environ.get('XDG_CONFIG_HOME')]
+    cache_path = user_dir() / 'hatch_config.json'
+    try:
+        cached = json.loads(cache_path.read_text())
+        if cached['key'] == key:
+            return str(cached['path'])
+    except (OSError, ValueError, KeyError, TypeError):  # missing or invalid cache
+        pass
+    config_path = subprocess.check_output(['hatch', 'config', 'find'], text=True).rstrip('\n')
+    try:
+        cache_path.write_text(json.dumps({'key': key, 'path': config_path}))
+    except OSError:
+        pass
+    return config_path
+
+
 class Scaffolder(ABC):
     """Class for setting up a project scaffold."""
 
@@ -26,9 +49,7 @@ class HatchScaffolder(Scaffolder):
     """Project scaffolder that uses the 'hatch' command-line tool."""
 
     def make_scaffold(self, base_dir: Path, project_name: str) -> None:  # noqa: D102
-        cmd = ['hatch', 'config', 'find']
-        config_path = subprocess.check_output(cmd, text=True).rstrip('\n')
-        logger.info(f'Using hatch configurations in {config_path}')
+        logger.info(f'Using hatch configurations in {_hatch_config_path()}')
         location = base_dir / project_name
         cmd = ['hatch', 'new', project_name, str(location)]
         run_command(cmd)
@@ -53,7 +74,7 @@ SCAFFOLDERS = {
 
 
 @dataclass
-class ScaffoldCmd(CLIDataclass, command_name='scaffold'):
+class ScaffoldCmd(LazyCLIDataclass, command_name='scaffold'):
     """Set up a project scaffold."""
     project_name: str = field(metadata={'help': 'name of project'})
     utility: ScaffoldUtility = field(default='hatch', metadata={'help': 'utility for creating the scaffold'})
@@ -1,27 +1,44 @@
-from dataclasses import dataclass, field
+from collections.abc import Iterator
+from copy import deepcopy
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import cache
+import os
 from pathlib import Path
-from typing import Annotated, Optional
+import sys
+from typing import IO, Annotated, Any, Optional, get_type_hints
 
 from fancy_dataclass import ConfigDataclass, TOMLDataclass
-from typing_extensions import Doc
+import tomli_w
+from typing_extensions import Doc, Self
 
 from milieux import PKG_NAME
 from milieux.errors import ConfigNotFoundError
-from milieux.utils import resolve_path
+from milieux.utils import AnyPath, resolve_path
+
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
 
 
 #################
 # DEFAULT PATHS #
 #################
 
+# NOTE: these paths are cached, so if the home directory changes, each function's cache_clear() must be called
+
+@cache
 def user_dir() -> Path:
     """Gets the path to the user's directory where configs, etc. will be stored."""
     return Path.home() / f'.{PKG_NAME}'
 
+@cache
 def user_default_config_path() -> Path:
     """Gets the default path to the user's config file."""
     return user_dir() / 'config.toml'
 
+@cache
 def user_default_base_dir() -> Path:
     """Gets the default path to the user's base workspace directory."""
     return user_dir() / 'workspace'
@@ -43,6 +60,32 @@ def set_config_path(cfg_path: Path) -> None:
 # CONFIG #
 ##########
 
+# cache of parsed config files, mapping from path to ((mtime_ns, size), config)
+_CONFIG_CACHE: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+def _toml_lines(obj: Any, prefix: str = '') -> Iterator[str]:
+    """Generates the lines of a TOML representation of a dataclass, preceding each field with its documentation as a comment.
+    None-valued fields are shown commented out, and nested dataclasses are written as tables after all other fields."""
+    hints = get_type_hints(type(obj), include_extras=True)
+    tables = []
+    for fld in fields(obj):
+        val = getattr(obj, fld.name)
+        if is_dataclass(val):
+            tables.append((fld.name, val))
+            continue
+        for meta in getattr(hints[fld.name], '__metadata__', ()):
+            if isinstance(meta, Doc):
+                yield from (f'# {line}' for line in meta.documentation.splitlines())
+        if val is None:
+            yield f'# {fld.name} = '
+        else:
+            yield tomli_w.dumps({fld.name: val}).rstrip('\n')
+    for (name, val) in tables:
+        yield ''
+        yield f'[{prefix}{name}]'
+        yield from _toml_lines(val, prefix=f'{prefix}{name}.')
+
+
 @dataclass
 class PipConfig(TOMLDataclass):
     """Configurations for pip."""
@@ -69,6 +112,39 @@ class Config(ConfigDataclass, TOMLDataclass):
     ] = 'distros'
     pip: PipConfig = field(default_factory=PipConfig)
 
+    @classmethod
+    def load_config(cls, path: AnyPath) -> Self:
+        """Loads configurations from a file and sets them to be the global configurations.
+        Parsed files are cached in memory, so the file is only re-parsed if its modification time or size has changed."""
+        path = Path(path)
+        # open the file once, using its descriptor both to check the cache and to parse
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = _CONFIG_CACHE.get(path)
+            if (cached is None) or (cached[0] != key) or (not isinstance(cached[1], cls)):
+                if path.suffix.lower() == '.toml':
+                    # parse with tomllib, which is much faster than the style-preserving parser used for writing
+                    cfg = cls.from_dict(tomllib.load(f))
+                else:
+                    cfg = super().load_config(path)
+                _CONFIG_CACHE[path] = (key, cfg)
+            else:
+                cfg = cached[1]
+        # return a copy so that callers cannot mutate the cached object
+        cfg = deepcopy(cfg)
+        cfg.update_config()
+        return cfg
+
+    @classmethod
+    def _to_text_file(cls, obj: Self, fp: IO[str], **kwargs: Any) -> None:
+        """Writes the configurations as TOML to a text file; all other ways of saving (save, to_toml, to_toml_string) go through this.
+        Since configs are always written from scratch, this writes the TOML directly instead of building a style-preserving document (unless kwargs are given)."""
+        if kwargs:
+            super()._to_text_file(obj, fp, **kwargs)
+        else:
+            fp.write('\n'.join(_toml_lines(obj)) + '\n')
+
     @property
     def base_dir_path(self) -> Path:
         """Gets the path to the base workspace directory."""
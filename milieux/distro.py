@@ -1,15 +1,16 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
+import os
 from pathlib import Path
-from subprocess import CalledProcessError
-from typing import Annotated, Optional
+from subprocess import PIPE, CalledProcessError, CompletedProcess
+from typing import IO, Annotated, Any, Optional
 
 from typing_extensions import Doc, Self
 
 from milieux import logger
 from milieux.config import get_config, update_command_with_index_url
 from milieux.errors import DistroExistsError, InvalidDistroError, NoPackagesError, NoSuchDistroError, NoSuchRequirementsFileError
-from milieux.utils import AnyPath, distro_sty, ensure_path, eprint, read_lines, run_command
+from milieux.utils import AnyPath, distro_sty, ensure_path, eprint, replace_file, run_command
 
 
 def get_distro_base_dir() -> Path:
@@ -24,22 +25,33 @@ def get_requirements(requirements: Optional[Sequence[AnyPath]] = None, distros:
         reqs += [str(Distro(name).path) for name in distros]
     return reqs
 
-def get_packages(packages: Optional[Sequence[str]] = None, requirements: Optional[Sequence[AnyPath]] = None, distros: Optional[Sequence[str]] = None) -> list[str]:
-    """Given a list of packages and a list of requirements files, gets a list of all packages therein.
-    Deduplicates any identical entries, and sorts alphabetically."""
+def iter_packages(packages: Optional[Sequence[str]] = None, requirements: Optional[Sequence[AnyPath]] = None, distros: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """Given a list of packages and a list of requirements files, iterates through all packages therein, skipping comments.
+    Deduplicates any identical entries, yielding each one in the order it first appears."""
     reqs = get_requirements(requirements, distros)
     if (not packages) and (not reqs):
         raise NoPackagesError('Must specify at least one package')
-    pkgs: set[str] = set()
-    if packages:
-        pkgs.update(packages)
-    if reqs:
-        for req in reqs:
-            try:
-                pkgs.update(stripped for line in read_lines(req) if (stripped := line.strip()))
-            except FileNotFoundError as e:
-                raise NoSuchRequirementsFileError(str(req)) from e
-    return sorted(pkgs)
+    seen: set[str] = set()
+    for pkg in (packages or []):
+        if pkg not in seen:
+            seen.add(pkg)
+            yield pkg
+    for req in reqs:
+        try:
+            with open(req) as f:
+                for line in f:
+                    pkg = line.strip()
+                    if pkg and (not pkg.startswith('#')) and (pkg not in seen):
+                        seen.add(pkg)
+                        yield pkg
+        except FileNotFoundError as e:
+            raise NoSuchRequirementsFileError(str(req)) from e
+
+def get_packages(packages: Optional[Sequence[str]] = None, requirements: Optional[Sequence[AnyPath]] = None, distros: Optional[Sequence[str]] = None) -> list[str]:
+    """Given a list of packages and a list of requirements files, gets a list of all packages therein.
+    Deduplicates any identical entries, and sorts alphabetically.
+    NOTE: comment lines (starting with '#') in the requirements files are dropped, so a distro created from a requirements file does not include its comments."""
+    return sorted(iter_packages(packages, requirements, distros))
 
 
 @dataclass
@@ -66,27 +78,40 @@ class Distro:
         return self._path
 
     def get_packages(self) -> list[str]:
-        """Gets the list of packages in the distro."""
+        """Gets the list of packages in the distro.
+        If no such distro exists, raises a NoSuchDistroError."""
         packages = []
-        for line in read_lines(self.path):
-            line = line.strip()
-            if not line.startswith('#'):  # skip comments
-                packages.append(line)
+        try:  # rely on the open failing rather than checking for existence first
+            with open(self._path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line.startswith('#'):  # skip comments
+                        packages.append(line)
+        except FileNotFoundError as e:
+            raise NoSuchDistroError(self.name) from e
         return packages
 
-    def lock(self, annotate: bool = False) -> str:
-        """Locks the packages in a distro to their pinned versions.
-        Returns the output as a string."""
+    def _lock(self, annotate: bool, **kwargs: Any) -> CompletedProcess[str]:
         logger.info(f'Locking dependencies for {distro_sty(self.name)} distro')
         cmd = ['uv', 'pip', 'compile', str(self.path)]
         update_command_with_index_url(cmd)
         if not annotate:
             cmd.append('--no-annotate')
         try:
-            return run_command(cmd, check=True, text=True, capture_output=True).stdout
+            return run_command(cmd, check=True, text=True, stderr=PIPE, **kwargs)
         except CalledProcessError as e:
             raise InvalidDistroError('\n' + e.stderr) from e
 
+    def lock(self, annotate: bool = False) -> str:
+        """Locks the packages in a distro to their pinned versions.
+        Returns the output as a string."""
+        return self._lock(annotate, stdout=PIPE).stdout
+
+    def lock_to(self, out: IO[str], annotate: bool = False) -> None:
+        """Locks the packages in a distro to their pinned versions.
+        Streams the output directly to the given file object, which must have a file descriptor."""
+        self._lock(annotate, stdout=out)
+
     @classmethod
     def new(cls,
         name: str,
@@ -96,22 +121,44 @@ class Distro:
         force: bool = False
     ) -> Self:
         """Creates a new distro."""
-        packages = get_packages(packages, requirements, distros)
-        distro_base_dir = get_distro_base_dir()
-        distro_path = distro_base_dir / f'{name}.txt'
+        distro = cls(name)
+        distro.create(packages=packages, requirements=requirements, distros=distros, force=force)
+        return distro
+
+    def _prepare_create(self, force: bool) -> Path:
+        """Checks whether the distro already exists, and returns the path to write to.
+        If it exists and force=True, only logs a warning that it will be overwritten (the caller overwrites the file), otherwise raises a DistroExistsError."""
+        distro_path = self._path
         if distro_path.exists():
-            msg = f'Distro {distro_sty(name)} already exists'
+            msg = f'Distro {distro_sty(self.name)} already exists'
             if force:
                 logger.warning(f'{msg} -- overwriting')
-                distro_path.unlink()
             else:
                 raise DistroExistsError(msg)
-        logger.info(f'Creating distro {distro_sty(name)}')
-        with open(distro_path, 'w') as f:
-            for pkg in packages:
-                print(pkg, file=f)
-        logger.info(f'Wrote {distro_sty(name)} requirements to {distro_path}')
-        return cls(name, distro_base_dir)
+        logger.info(f'Creating distro {distro_sty(self.name)}')
+        return distro_path
+
+    def create(self,
+        packages: Optional[list[str]] = None,
+        requirements: Optional[Sequence[AnyPath]] = None,
+        distros: Optional[list[str]] = None,
+        force: bool = False
+    ) -> None:
+        """Writes this distro's requirements file, given a list of packages, requirements files, and/or distro names.
+        If force=True, overwrites the distro if it already exists."""
+        packages = get_packages(packages, requirements, distros)
+        distro_path = self._prepare_create(force)
+        distro_path.write_text(''.join(f'{pkg}\n' for pkg in packages))
+        logger.info(f'Wrote {distro_sty(self.name)} requirements to {distro_path}')
+
+    def create_locked(self, distro: 'Distro', annotate: bool = False, force: bool = False) -> None:
+        """Writes this distro's requirements file by locking the dependencies of another distro.
+        The locked output is streamed into a temporary file, which replaces the distro file only once locking succeeds.
+        If force=True, overwrites the distro if it already exists."""
+        distro_path = self._prepare_create(force)
+        with replace_file(distro_path) as f:
+            distro.lock_to(f, annotate=annotate)
+        logger.info(f'Wrote {distro_sty(self.name)} requirements to {distro_path}')
 
     def remove(self) -> None:
         """Deletes the distro."""
@@ -122,9 +169,10 @@ class Distro:
 
     def show(self) -> None:
         """Prints out the packages in the distro."""
-        eprint(f'Distro {distro_sty(self.name)} is located at: {self.path}')
+        packages = self.get_packages()
+        eprint(f'Distro {distro_sty(self.name)} is located at: {self._path}')
         eprint('──────────\n [bold]Packages[/]\n──────────')
-        for pkg in self.get_packages():
+        for pkg in packages:
             print(pkg)
 
     # NOTE: due to a bug in mypy (https://github.com/python/mypy/issues/15047), this method must come last
@@ -133,7 +181,9 @@ class Distro:
         """Prints the list of existing distros."""
         distro_base_dir = get_distro_base_dir()
         eprint(f'Distro directory: {distro_base_dir}')
-        distros = sorted([p.stem for p in distro_base_dir.glob('*.txt') if p.is_file()])
+        # scandir reports each entry's file type from the directory listing itself, avoiding a stat per file
+        with os.scandir(distro_base_dir) as entries:
+            distros = sorted([entry.name[:-4] for entry in entries if entry.name.endswith('.txt') and entry.is_file()])
         if distros:
             eprint('─────────\n [bold]Distros[/]\n─────────')
             for distro in distros:
@@ -1,22 +1,26 @@
 from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cache, cached_property
 import json
 import os
 from pathlib import Path
 import re
 import shutil
 from subprocess import CalledProcessError, CompletedProcess
-from typing import Annotated, Any, Optional
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Optional
 
-import jinja2
 from typing_extensions import Doc, Self
 
 from milieux import PROG, logger
 from milieux.config import get_config, update_command_with_index_url
 from milieux.distro import get_requirements
-from milieux.errors import EnvError, EnvironmentExistsError, MilieuxError, NoPackagesError, NoSuchEnvironmentError, TemplateError
-from milieux.utils import AnyPath, ensure_path, env_sty, eprint, run_command
+from milieux.errors import EnvError, EnvironmentExistsError, MilieuxError, NoPackagesError, NoSuchEnvironmentError, NoSuchTemplateError, TemplateError
+from milieux.utils import AnyPath, ensure_path, env_sty, eprint, replace_file, run_command
+
+
+if TYPE_CHECKING:
+    import jinja2
 
 
 def get_env_base_dir() -> Path:
@@ -38,6 +42,59 @@ TEMPLATE_ENV_VARS = {
     'ENV_PYVERSION_MINOR': 'Minor Python version for the environment (e.g. 3.11)',
 }
 
+# help text listing the template environment variables (one per line)
+TEMPLATE_ENV_VARS_HELP = '\n'.join(f'\t{key}: {val}' for (key, val) in TEMPLATE_ENV_VARS.items())
+
+
+@cache
+def _get_jinja_environment() -> 'jinja2.Environment':
+    """Gets the jinja environment used to render template files, which is shared by all renders in the process.
+    Templates are loaded by path, so compiled templates are cached in memory (and their bytecode on disk, in the jinja_cache subdirectory of the user's directory), and only recompiled when the file changes."""
+    import jinja2  # defer import, since it is only needed for rendering templates
+
+    class PathLoader(jinja2.BaseLoader):
+        """Jinja loader where template names are filesystem paths."""
+
+        def get_source(self, environment: jinja2.Environment, template: str) -> tuple[str, str, Callable[[], bool]]:
+            path = Path(template)
+            try:
+                with open(path) as f:
+                    mtime = os.fstat(f.fileno()).st_mtime_ns
+                    source = f.read()
+            except (FileNotFoundError, IsADirectoryError) as e:
+                raise jinja2.TemplateNotFound(template) from e
+            def uptodate() -> bool:
+                try:
+                    return path.stat().st_mtime_ns == mtime
+                except OSError:
+                    return False
+            return (source, template, uptodate)
+
+    from milieux.config import user_dir
+    bytecode_cache: Optional[jinja2.BytecodeCache] = None
+    cache_dir = user_dir() / 'jinja_cache'
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(cache_dir))
+    except OSError:  # cache directory is not writable, so only cache in memory
+        pass
+    return jinja2.Environment(
+        loader=PathLoader(),
+        undefined=jinja2.StrictUndefined,  # error if unknown variables are present
+        bytecode_cache=bytecode_cache,
+    )
+
+def load_template(template: Path) -> 'jinja2.Template':
+    """Loads and compiles a jinja template from a file.
+    Raises a NoSuchTemplateError if the file does not exist, or a TemplateError if the template is invalid."""
+    import jinja2
+    try:
+        return _get_jinja_environment().get_template(str(template.absolute()))
+    except jinja2.TemplateNotFound as e:
+        raise NoSuchTemplateError(template) from e
+    except jinja2.exceptions.TemplateError as e:
+        raise TemplateError(f'Error rendering template {template} - {e}') from e
+
 
 @dataclass
 class Environment:
@@ -96,9 +153,10 @@ class Environment:
         assert isinstance(version, str)
         return version
 
-    @property
+    @cached_property
     def template_env_vars(self) -> dict[str, Any]:
         """Gets a mapping from template environment variables to their values for this environment.
+        This is computed once per instance, so rendering several templates only reads the environment config once.
         NOTE: the values may be strings or Path objects (the latter make it easier to perform path operations within a jinja template)."""
         pyversion = self.python_version
         pyversion_minor = '.'.join(pyversion.split('.')[:2])
@@ -244,27 +302,37 @@ class Environment:
         shutil.rmtree(env_dir)
         logger.info(f'Deleted {env_dir}')
 
+    def render_templates(self, templates: Sequence[Path], suffix: Optional[str] = None, extra_vars: Optional[dict[str, Any]] = None) -> None:
+        """Renders one or more jinja templates, filling in variables from the environment.
+        If suffix is None, prints the output to stdout.
+        Otherwise, saves a new file for each template with the original file extension replaced by this suffix.
+        extra_vars is an optional mapping from extra variables to values.
+        All templates are loaded before any is rendered, so a missing or invalid template produces no partial output."""
+        import jinja2
+        input_templates = [load_template(template) for template in templates]
+        kwargs = {**self.template_env_vars, **(extra_vars or {})}
+        if (suffix is not None) and (not suffix.startswith('.')):
+            suffix = '.' + suffix
+        for (template, input_template) in zip(templates, input_templates):
+            try:
+                if suffix is None:
+                    print(input_template.render(**kwargs))
+                    continue
+                output_path = template.with_suffix(suffix)
+                # stream the output into a temporary file, which replaces the output file only once rendering succeeds
+                with replace_file(output_path) as f:
+                    f.writelines(input_template.generate(**kwargs))
+            except jinja2.exceptions.TemplateError as e:
+                msg = f'Error rendering template {template} - {e}'
+                raise TemplateError(msg) from e
+            logger.info(f'Rendered template {template} to {output_path}')
+
     def render_template(self, template: Path, suffix: Optional[str] = None, extra_vars: Optional[dict[str, Any]] = None) -> None:
         """Renders a jinja template, filling in variables from the environment.
         If suffix is None, prints the output to stdout.
         Otherwise, saves a new file with the original file extension replaced by this suffix.
         extra_vars is an optional mapping from extra variables to values."""
-        # error if unknown variables are present
-        env = jinja2.Environment(undefined=jinja2.StrictUndefined)
-        try:
-            input_template = env.from_string(template.read_text())
-            kwargs = {**self.template_env_vars, **(extra_vars or {})}
-            output = input_template.render(**kwargs)
-        except jinja2.exceptions.TemplateError as e:
-            msg = f'Error rendering template {template} - {e}'
-            raise TemplateError(msg) from e
-        if suffix is None:
-            print(output)
-        else:
-            suffix = suffix if suffix.startswith('.') else ('.' + suffix)
-            output_path = template.with_suffix(suffix)
-            output_path.write_text(output)
-            logger.info(f'Rendered template {template} to {output_path}')
+        self.render_templates([template], suffix=suffix, extra_vars=extra_vars)
 
     def show(self, list_packages: bool = False) -> None:
         """Shows details about the environment."""
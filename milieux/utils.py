@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+import os
 from pathlib import Path
 import shlex
 import subprocess
-from typing import Any, Union
+import sys
+import tempfile
+from typing import Any, TextIO, Union
 
-from rich.prompt import InvalidResponse, Prompt
-
-from milieux import console, logger
+from rich.console import Console
+from rich.prompt import Confirm, InvalidResponse, Prompt
+from rich.text import TextType
 
 
 AnyPath = Union[str, Path]
@@ -16,6 +21,7 @@ AnyPath = Union[str, Path]
 def run_command(cmd: list[Any], **kwargs: Any) -> subprocess.CompletedProcess[str]:
     """Runs a command (provided as a list) via subprocess.
     Passes any kwargs to subprocess.run."""
+    from milieux import logger
     cmd = [str(token) for token in cmd]
     logger.info(shlex.join(cmd))
     kwargs = {'text': True, **kwargs}  # use text mode by default
@@ -44,21 +50,69 @@ def ensure_path(path: Path) -> Path:
     """If the given path does not exist, creates it.
     Then returns the Path."""
     if not path.exists():
+        from milieux import logger
         logger.info(f'mkdir -p {path}')
         path.mkdir(parents=True)
     return path
 
-def read_lines(path: AnyPath) -> list[str]:
-    """Reads lines of text from a file."""
-    return Path(path).read_text().splitlines()
+@contextmanager
+def replace_file(path: Path) -> Iterator[TextIO]:
+    """Context manager yielding a temporary file (in the same directory as the given path) to write to.
+    Once the block exits without error, the temporary file replaces the path, otherwise it is deleted and the path is left untouched.
+    If the path is a symlink, its target is replaced, and the target's permissions are preserved."""
+    path = path.resolve()
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    tmp_path = Path(tmp_name)
+    try:
+        try:
+            mode = path.stat().st_mode
+        except FileNotFoundError:  # use the mode a newly created file would get
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        tmp_path.chmod(mode & 0o7777)
+        with open(fd, 'w') as f:
+            yield f
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 ##########
 # PROMPT #
 ##########
 
-class NonemptyPrompt(Prompt):
-    """Subclass of rich.prompt.Prompt requiring the input to be non-empty."""
+def _read_line(console: Console, prompt: TextType, password: bool, stream: TextIO | None = None) -> str:
+    """Displays a prompt, then reads a line of input from stdin.
+    Unlike the builtin `input` (used by rich by default), this does not flush stdout/stderr redundantly.
+    Raises EOFError if stdin is exhausted."""
+    if password or (stream is not None):
+        return console.input(prompt, password=password, stream=stream)
+    console.print(prompt, end='')
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
+class LinePrompt(Prompt):
+    """Subclass of rich.prompt.Prompt reading input via `sys.stdin.readline`."""
+
+    @classmethod
+    def get_input(cls, console: Console, prompt: TextType, password: bool, stream: TextIO | None = None) -> str:  # noqa: D102
+        return _read_line(console, prompt, password, stream=stream)
+
+
+class LineConfirm(Confirm):
+    """Subclass of rich.prompt.Confirm reading input via `sys.stdin.readline`."""
+
+    @classmethod
+    def get_input(cls, console: Console, prompt: TextType, password: bool, stream: TextIO | None = None) -> str:  # noqa: D102
+        return _read_line(console, prompt, password, stream=stream)
+
+
+class NonemptyPrompt(LinePrompt):
+    """Subclass of LinePrompt requiring the input to be non-empty."""
 
     def process_response(self, value: str) -> str:  # noqa: D102
         if not value.strip():
@@ -72,8 +126,21 @@ class NonemptyPrompt(Prompt):
 
 def eprint(s: str, **kwargs: Any) -> None:
     """Prints a string to stderr."""
+    from milieux import console
     console.print(s, **kwargs)
 
+def write_stdout(s: str) -> None:
+    """Writes a string to stdout in one call to its underlying binary buffer, encoded with stdout's own encoding and error handler.
+    If stdout has no binary buffer (e.g. it is redirected to a StringIO), falls back to an ordinary write."""
+    stdout = sys.stdout
+    buffer = getattr(stdout, 'buffer', None)
+    if buffer is None:
+        stdout.write(s)
+    else:
+        stdout.flush()  # preserve ordering with anything already written as text
+        buffer.write(s.encode(stdout.encoding, stdout.errors or 'strict'))
+        buffer.flush()
+
 PALETTE = {
     'distro': 'dark_orange3',
     'env': 'green4',
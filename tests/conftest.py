@@ -4,6 +4,15 @@ from tempfile import TemporaryDirectory
 import pytest
 
 from milieux.config import Config, user_default_base_dir, user_default_config_path, user_dir
+from milieux.env import _get_jinja_environment
+
+
+def _clear_path_caches():
+    """Clears cached default paths (and the jinja environment, whose bytecode cache lives in the user's directory), which depend on the user's home directory."""
+    user_dir.cache_clear()
+    user_default_config_path.cache_clear()
+    user_default_base_dir.cache_clear()
+    _get_jinja_environment.cache_clear()
 
 
 @pytest.fixture()
@@ -13,6 +22,7 @@ def tmp_config(monkeypatch):
         home_dir = pathlib.Path(tmpdir) / 'home'
         home_dir.mkdir()
         monkeypatch.setattr('pathlib.Path.home', lambda: home_dir)
+        _clear_path_caches()
         user_dir().mkdir()
         user_default_base_dir().mkdir()
         cfg = Config()  # default configs
@@ -20,3 +30,4 @@ def tmp_config(monkeypatch):
             cfg_path = user_default_config_path()
             cfg.save(cfg_path)
             yield cfg
+    _clear_path_caches()
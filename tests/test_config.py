@@ -1,6 +1,39 @@
+from io import BytesIO, StringIO
+
 from milieux import PKG_DIR
+from milieux.config import Config, PipConfig, tomllib, user_default_config_path
 
 
 def test_pkg_dir_valid():
     """Tests that the root PKG_DIR variable is valid."""
     assert PKG_DIR.exists()
+
+
+def test_load_config_cache(tmp_config):
+    """Tests that a cached config is reused until the file changes, and that callers get their own copy."""
+    cfg_path = user_default_config_path()
+    cfg1 = Config.load_config(cfg_path)
+    cfg1.pip.index_url = 'modified'
+    cfg2 = Config.load_config(cfg_path)
+    assert cfg2.pip.index_url is None
+    assert Config.get_config() is cfg2
+    cfg2.env_dir = 'other_envs'
+    cfg2.save(cfg_path)
+    assert Config.load_config(cfg_path).env_dir == 'other_envs'
+
+
+def test_config_to_toml_string(tmp_path):
+    """Tests that the direct TOML writer matches the style-preserving one, including field comments, and that all the ways of saving use it."""
+    for cfg in [Config(base_dir='/base'), Config(base_dir='/base"dir', pip=PipConfig(index_url='https://example.com'))]:
+        s = cfg.to_toml_string()
+        assert s == cfg.to_toml_string(sort_keys=False)
+        assert '# directory for virtual environments\n' in s
+        assert Config.from_dict(tomllib.loads(s)) == cfg
+        cfg.save(tmp_path / 'config.toml')
+        assert (tmp_path / 'config.toml').read_text() == s
+        with StringIO() as sio:
+            cfg.save(sio)
+            assert sio.getvalue() == s
+        with BytesIO() as bio:
+            cfg.save(bio)
+            assert bio.getvalue() == s.encode()
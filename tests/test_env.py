@@ -29,3 +29,5 @@ def test_template(monkeypatch, tmp_config):
     assert env_vars['ENV_PYVERSION'] == pyversion
     assert env_vars['ENV_PYVERSION_MINOR'] == pyversion_minor
     assert env_vars['ENV_SITE_PACKAGES_DIR'] == tmp_config.env_dir_path / name / 'lib' / f'python{pyversion_minor}' / 'site-packages'
+    # values are computed once per environment
+    assert env.template_env_vars is env_vars
@@ -1,3 +1,4 @@
+import argparse
 from contextlib import redirect_stdout
 from datetime import datetime
 from io import StringIO
@@ -7,16 +8,19 @@ from pathlib import Path
 import re
 import shutil
 import subprocess
+import sys
 from typing import get_args, get_type_hints
 
 import pytest
 
 from milieux import PROG, __version__
+from milieux.__main__ import main
+from milieux.cli.lazy import LazyArgumentParser
 from milieux.cli.main import MilieuxCLI
-from milieux.config import Config, user_default_base_dir, user_default_config_path
+from milieux.cli.scaffold import _hatch_config_path
+from milieux.config import Config, user_default_base_dir, user_default_config_path, user_dir
 from milieux.distro import Distro
 from milieux.env import Environment
-from milieux.utils import read_lines
 
 from . import TEST_DATA_DIR, check_main
 
@@ -36,6 +40,12 @@ def test_main_version():
     check_main(['--version', 'config', 'show'], stdout=version)
     check_main(['config', 'show', '--version'], stderr='unrecognized arguments: --version', success=False)
 
+def test_entry_point_version(monkeypatch, capsys):
+    """Tests that the executable's entry point answers --version the same way as the full CLI."""
+    monkeypatch.setattr('sys.argv', [PROG, '--version'])
+    main()
+    assert capsys.readouterr().out == f'{PROG} {__version__}\n'
+
 def test_subcommand_help():
     """Tests running each of the subcommands with --help."""
     for subcmd in get_args(get_type_hints(MilieuxCLI)['subcommand']):
@@ -43,6 +53,21 @@ def test_subcommand_help():
             cmd_name = subcmd.__settings__.command_name
             check_main([cmd_name, '--help'], stdout=[cmd_name, '--help'])
 
+def test_subcommand_lazy_parser():
+    """Tests that subcommand arguments are only configured when the subcommand is used."""
+    parser = MilieuxCLI.new_parser()
+    MilieuxCLI.configure_parser(parser)
+    assert isinstance(parser, LazyArgumentParser)
+    parser.parse_args(['distro', 'list'])
+    [subparsers] = [action for action in parser._actions if isinstance(action, argparse._SubParsersAction)]
+    configured = {name for (name, subparser) in subparsers.choices.items() if subparser._configure is None}
+    assert configured == {'distro'}
+
+def test_logging_deferred():
+    """Tests that the rich log handler is only set up once something is logged."""
+    code = 'import sys, milieux.cli.main; loaded = "rich.logging" in sys.modules; milieux.logger.info("hi"); print(loaded, "rich.logging" in sys.modules)'
+    assert subprocess.check_output([sys.executable, '-c', code], text=True, stderr=subprocess.DEVNULL).split() == ['False', 'True']
+
 def check_package(env: Environment, pkg_name: str, exists: bool, editable: bool = False) -> None:
     glob = env.site_packages_dir.glob(f'{pkg_name}*.dist-info' if editable else pkg_name)
     pkg_dirs = [p for p in glob if p.is_dir()]
@@ -93,6 +118,10 @@ class TestConfig:
         check_main(['config', 'new'], stdin=['', 'y', '', ''], stderr=f'Created directory {base_dir}')
         assert base_dir.exists()
         assert cfg_path.exists()
+        # create config file at a custom path that does not exist yet
+        other_cfg_path = base_dir / 'other.toml'
+        check_main(['-c', str(other_cfg_path), 'config', 'new'], stdin=['', '', ''], stderr=f'Saved config file to {other_cfg_path}')
+        assert Config.load_config(other_cfg_path) == Config.load_config(cfg_path)
 
     def test_config_path(self, tmp_config):
         cfg_path = user_default_config_path()
@@ -127,12 +156,31 @@ class TestScaffold:
         assert project_path.is_dir()
         assert (project_path / 'README.md').exists()
 
+    def test_hatch_config_cache(self, monkeypatch, tmp_config):
+        calls = []
+        def check_output(cmd, **kwargs):
+            calls.append(cmd)
+            return f'/path/to/config{len(calls)}.toml\n'
+        monkeypatch.setattr('subprocess.check_output', check_output)
+        monkeypatch.delenv('HATCH_CONFIG', raising=False)
+        # first call runs hatch and caches the result
+        assert _hatch_config_path() == '/path/to/config1.toml'
+        assert calls == [['hatch', 'config', 'find']]
+        # cache hit skips the subprocess
+        assert _hatch_config_path() == '/path/to/config1.toml'
+        assert len(calls) == 1
+        # changing an environment variable in the cache key invalidates the cache
+        monkeypatch.setenv('HATCH_CONFIG', '/other/config.toml')
+        assert _hatch_config_path() == '/path/to/config2.toml'
+        assert _hatch_config_path() == '/path/to/config2.toml'
+        assert len(calls) == 2
+
 
 class TestDistro:
 
     def _check_distro(self, distro_path, packages):
         name = distro_path.stem
-        lines = read_lines(distro_path)
+        lines = distro_path.read_text().splitlines()
         assert lines == packages
         # check that 'show' command prints out the packages
         check_main(['distro', 'show', name], stderr=f'Distro {name} is located at: {distro_path}', stdout=packages)
@@ -198,11 +246,20 @@ class TestDistro:
         self._check_distro(distro.path, ['file://project1'])
         # save a new distro (uses a date suffix)
         check_main(['distro', 'lock', name, '--new'], stderr=r'Wrote mydist.\d{8} requirements to')
+        check_main(['distro', 'lock', name, '--new', 'mydist_locked'], stderr='Wrote mydist_locked requirements to')
+        lines = Distro('mydist_locked').path.read_text().splitlines()
+        assert lines[0].startswith('# This file was autogenerated')
+        assert lines[-1] == 'project1'
         # attempt to save distro to an existing one
         check_main(['distro', 'lock', name, '--new', name], stderr=f'Distro {name} already exists', success=False)
         # use nonexistent local package
         check_main(['distro', 'new', name, '--packages', 'file://project2', '-f'], stderr=f'Wrote {name} requirements')
         check_main(['distro', 'lock', name], stderr='Distribution not found at', success=False)
+        # failed lock leaves no new distro (or temporary file) behind
+        distro_files = sorted(tmp_config.distro_dir_path.iterdir())
+        check_main(['distro', 'lock', name, '--new', 'mydist_bad'], stderr='Distribution not found at', success=False)
+        assert not Distro('mydist_bad').exists()
+        assert sorted(tmp_config.distro_dir_path.iterdir()) == distro_files
 
 
 class TestEnv:
@@ -356,3 +413,30 @@ class TestEnv:
         msg = f'Rendered template {template_copy_path} to {output_copy_path}'
         check_main(['env', 'template', name, '-t', str(template_copy_path), '--extra-vars', 'CUSTOM_VAR=custom', '--suffix', 'out'], stderr=msg)
         assert output_copy_path.read_text() == expected_output.rstrip()
+        # compiled bytecode is cached in the user's directory
+        assert any((user_dir() / 'jinja_cache').iterdir())
+        # render multiple templates as files
+        template_copy_path2 = template_copy_path.with_name('activate2.jinja')
+        shutil.copy(template_path, template_copy_path2)
+        output_copy_path.unlink()
+        check_main(['env', 'template', name, '-t', str(template_copy_path), str(template_copy_path2), '--extra-vars', 'CUSTOM_VAR=custom', '--suffix', 'out'])
+        assert output_copy_path.read_text() == expected_output.rstrip()
+        assert template_copy_path2.with_suffix('.out').read_text() == expected_output.rstrip()
+        # re-rendering writes through a symlinked output file, keeping its permissions
+        link_target = tmp_config.base_dir_path / 'target.txt'
+        link_target.write_text('old')
+        link_target.chmod(0o640)
+        output_copy_path.unlink()
+        output_copy_path.symlink_to(link_target)
+        check_main(['env', 'template', name, '-t', str(template_copy_path), '--extra-vars', 'CUSTOM_VAR=custom', '--suffix', 'out'], stderr=msg)
+        assert output_copy_path.is_symlink()
+        assert link_target.read_text() == expected_output.rstrip()
+        assert link_target.stat().st_mode & 0o777 == 0o640
+        # a missing template means nothing is rendered
+        output_copy_path.unlink()
+        missing_path = tmp_config.base_dir_path / 'missing.jinja'
+        check_main(['env', 'template', name, '-t', str(template_copy_path), str(missing_path), '--extra-vars', 'CUSTOM_VAR=custom', '--suffix', 'out'], stderr='does not exist', success=False)
+        assert not output_copy_path.exists()
+        # a rendering error leaves no output file behind
+        check_main(['env', 'template', name, '-t', str(template_copy_path), '--suffix', 'out'], stderr="'CUSTOM_VAR' is undefined", success=False)
+        assert list(tmp_config.base_dir_path.glob('*.out*')) == [template_copy_path2.with_suffix('.out')]
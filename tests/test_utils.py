@@ -1,8 +1,10 @@
+import io
 from pathlib import Path
+import sys
 
 import pytest
 
-from milieux.utils import resolve_path
+from milieux.utils import resolve_path, write_stdout
 
 
 def test_resolve_path(tmpdir):
@@ -17,3 +19,17 @@ def test_resolve_path(tmpdir):
     subdir = Path(tmpdir / 'subdir')
     assert resolve_path('..', subdir) == tmpdir
     assert resolve_path('../file.txt', subdir) == p
+
+
+def test_write_stdout(monkeypatch):
+    """Tests that write_stdout writes everything, using stdout's own encoding and error handler."""
+    buf = io.BytesIO()
+    monkeypatch.setattr('sys.stdout', io.TextIOWrapper(buf, encoding='latin-1', errors='replace'))
+    sys.stdout.write('a')
+    write_stdout('café ☃\n' * 10_000)
+    assert buf.getvalue() == b'a' + 'café ?\n'.encode('latin-1') * 10_000
+    # no binary buffer
+    sio = io.StringIO()
+    monkeypatch.setattr('sys.stdout', sio)
+    write_stdout('café ☃\n')
+    assert sio.getvalue() == 'café ☃\n'